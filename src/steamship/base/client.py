@@ -9,6 +9,7 @@ from typing import Any, List, Optional, Tuple, Type, TypeVar, Union
 import inflection
 from pydantic import BaseModel, PrivateAttr
 from requests import Session
+from requests.adapters import HTTPAdapter
 
 from steamship.base.configuration import Configuration
 from steamship.base.error import SteamshipError
@@ -22,6 +23,11 @@ _logger = logging.getLogger(__name__)
 
 T = TypeVar("T")  # TODO (enias): Do we need this?
 
+# Keep-alive connections retained per host. requests' default of 10 covers the default concurrency of
+# EmbeddingIndex.insert_many and search(parallel=True) (4 workers); the larger pool only matters when callers raise
+# `max_workers` past 10, so that the extra connections are reused rather than discarded.
+_CONNECTION_POOL_SIZE = 32
+
 
 def _multipart_name(path: str, val: Any) -> List[Tuple[Optional[str], str, Optional[str]]]:
     """Decode any object into a series of HTTP Multi-part segments that Vapor will consume.
@@ -80,6 +86,9 @@ class Client(CamelModel, ABC):
             config = Configuration.parse_obj(config)
 
         self._session = Session()
+        adapter = HTTPAdapter(pool_maxsize=_CONNECTION_POOL_SIZE)
+        self._session.mount("https://", adapter)
+        self._session.mount("http://", adapter)
         config = config or Configuration(
             api_key=api_key,
             api_base=api_base,
@@ -1,17 +1,35 @@
 from __future__ import annotations
 
-import json
-from typing import Any, Dict, List, Optional, Type, Union
+import threading
+from concurrent.futures import ThreadPoolExecutor, as_completed
+from itertools import islice
+from typing import Any, Dict, List, Optional, Tuple, Type, Union
 
-from pydantic import BaseModel, Field
+from pydantic import BaseModel, Field, PrivateAttr
 
-from steamship.base import Task
+from steamship.base import Task, TaskState
 from steamship.base.client import Client
+from steamship.base.error import SteamshipError
 from steamship.base.model import CamelModel
 from steamship.base.request import DeleteRequest, Request
 from steamship.base.response import Response
 from steamship.data.search import Hit
 from steamship.utils.metadata import metadata_to_str
+from steamship.utils.query_cache import QueryCache
+
+
+class _Operation:
+    """Engine operations exposed for embedding indices."""
+
+    create = "embedding-index/create"
+    insert = "embedding-index/item/create"
+    embed = "embedding-index/embed"
+    create_snapshot = "embedding-index/snapshot/create"
+    list_snapshots = "embedding-index/snapshot/list"
+    list_items = "embedding-index/item/list"
+    delete_snapshot = "embedding-index/snapshot/delete"
+    delete = "embedding-index/delete"
+    search = "embedding-index/search"
 
 
 class EmbedAndSearchRequest(Request):
@@ -46,21 +64,10 @@ class EmbeddedItem(CamelModel):
 
     def clone_for_insert(self) -> EmbeddedItem:
         """Produces a clone with a string representation of the metadata"""
-        ret = EmbeddedItem(
-            id=self.id,
-            index_id=self.index_id,
-            file_id=self.file_id,
-            block_id=self.block_id,
-            tag_id=self.tag_id,
-            value=self.value,
-            external_id=self.external_id,
-            external_type=self.external_type,
-            metadata=self.metadata,
-            embedding=self.embedding,
-        )
-        if isinstance(ret.metadata, dict) or isinstance(ret.metadata, list):
-            ret.metadata = json.dumps(ret.metadata)
-        return ret
+        metadata = self.metadata
+        if isinstance(metadata, (dict, list)):
+            metadata = metadata_to_str(metadata)
+        return self.copy(update={"metadata": metadata})
 
 
 class IndexCreateRequest(Request):
@@ -147,6 +154,56 @@ class DeleteSnapshotsResponse(Response):
     snapshot_id: str = None
 
 
+def _copy_search_task(task: Task[QueryResults]) -> Task[QueryResults]:
+    """Copy a search Task so that callers mutating its output cannot corrupt a cached result.
+
+    The copy carries no `task_id`: it stands for a new, already-completed search rather than the engine task that
+    originally produced the results, so comments added to one search are not shared with another.
+    """
+    output = task.output.copy(deep=True) if isinstance(task.output, BaseModel) else task.output
+    return task.copy(update={"output": output, "task_id": None})
+
+
+def _query_results(result: Union[Task[QueryResults], QueryResults]) -> QueryResults:
+    """The QueryResults of a search, whether the engine returned them in a Task or directly."""
+    return result.output if isinstance(result, Task) else result
+
+
+class _InsertManyTask(Task[IndexInsertResponse]):
+    """The Task of the last batch sent by `EmbeddingIndex.insert_many`.
+
+    Its output also lists the item IDs of the batches sent before it, including after the Task is refreshed.
+    """
+
+    _earlier_item_ids: List[IndexItemId] = PrivateAttr(default_factory=list)
+
+    @staticmethod
+    def of(
+        client: Client,
+        response: Union[Task[IndexInsertResponse], IndexInsertResponse],
+        earlier_item_ids: List[IndexItemId],
+    ) -> _InsertManyTask:
+        if isinstance(response, Task):
+            task = _InsertManyTask.construct(
+                _fields_set=response.__fields_set__, **response.__dict__
+            )
+        else:
+            task = _InsertManyTask(client=client, state=TaskState.succeeded, output=response)
+        task._earlier_item_ids = earlier_item_ids
+        task._merge_item_ids()
+        return task
+
+    def update(self, other: Optional[Task] = None):
+        super().update(other)
+        self._merge_item_ids()
+
+    def _merge_item_ids(self):
+        if isinstance(self.output, IndexInsertResponse):
+            self.output = IndexInsertResponse(
+                item_ids=[*self._earlier_item_ids, *(self.output.item_ids or [])]
+            )
+
+
 class EmbeddingIndex(CamelModel):
     """A persistent, read-optimized index over embeddings."""
 
@@ -159,6 +216,15 @@ class EmbeddingIndex(CamelModel):
     external_type: str = None
     metadata: str = None
 
+    # Client-side cache of completed searches, consulted only by `search(..., use_cache=True)`. It is cleared by
+    # every mutating method of this class and bypassed while a Task returned by one of them is still running.
+    # `_generation` counts invalidations, so that a search which raced a mutation does not cache its result; it and
+    # `_pending_mutations` are guarded by `_cache_lock`.
+    _cache: QueryCache = PrivateAttr(default_factory=QueryCache)
+    _cache_lock: threading.Lock = PrivateAttr(default_factory=threading.Lock)
+    _generation: int = PrivateAttr(default=0)
+    _pending_mutations: List[Task] = PrivateAttr(default_factory=list)
+
     @classmethod
     def parse_obj(cls: Type[BaseModel], obj: Any) -> BaseModel:
         # TODO (enias): This needs to be solved at the engine side
@@ -168,6 +234,65 @@ class EmbeddingIndex(CamelModel):
             obj = obj["index"]
         return super().parse_obj(obj)
 
+    def _post(
+        self,
+        operation: str,
+        payload: Request,
+        as_background_task: bool = False,
+    ) -> Any:
+        return self.client.post(
+            operation,
+            payload,
+            expect=_EXPECT[operation],
+            as_background_task=as_background_task,
+        )
+
+    def _invalidate(self, ret: Any) -> Any:
+        """Clear the search cache after submitting a mutation, and track it if it is still running."""
+        with self._cache_lock:
+            self._generation += 1
+            self._cache.clear()
+            if isinstance(ret, Task) and ret.state not in (TaskState.succeeded, TaskState.failed):
+                self._pending_mutations.append(ret)
+        return ret
+
+    def _cache_generation(self) -> Optional[int]:
+        """The current cache generation, or None if no mutation of this index may be running.
+
+        Mutation Tasks are only observed to finish once the caller waits on or refreshes them.
+        """
+        with self._cache_lock:
+            if self._pending_mutations:
+                pending = [
+                    task
+                    for task in self._pending_mutations
+                    if task.state not in (TaskState.succeeded, TaskState.failed)
+                ]
+                if len(pending) < len(self._pending_mutations):
+                    # A mutation finished since its submission; anything cached meanwhile may predate it.
+                    self._generation += 1
+                    self._cache.clear()
+                self._pending_mutations = pending
+            return None if self._pending_mutations else self._generation
+
+    def _cache_put(self, cache_key: Tuple, generation: int, task: Task[QueryResults]) -> None:
+        """Cache a completed search, unless the index was invalidated since the search began."""
+        with self._cache_lock:
+            if generation == self._generation:
+                self._cache.put(cache_key, _copy_search_task(task))
+
+    def search_cache_stats(self) -> Dict[str, Any]:
+        """Return the size, hits, misses and hit rate of this index's client-side search cache."""
+        return self._cache.get_stats()
+
+    def clear_search_cache(self) -> None:
+        """Drop every cached search result.
+
+        Call this after changing the index by any means other than the methods of this object, e.g. through
+        `client.post`, which the cache cannot observe.
+        """
+        self._invalidate(None)
+
     def insert_file(
         self,
         file_id: str,
@@ -177,8 +302,8 @@ class EmbeddingIndex(CamelModel):
         metadata: Union[int, float, bool, str, List, Dict] = None,
         reindex: bool = True,
     ) -> IndexInsertResponse:
-        if isinstance(metadata, dict) or isinstance(metadata, list):
-            metadata = json.dumps(metadata)
+        if isinstance(metadata, (dict, list)):
+            metadata = metadata_to_str(metadata)
 
         req = IndexInsertRequest(
             index_id=self.id,
@@ -189,34 +314,83 @@ class EmbeddingIndex(CamelModel):
             metadata=metadata,
             reindex=reindex,
         )
-        return self.client.post(
-            "embedding-index/item/create",
-            req,
-            expect=IndexInsertResponse,
-        )
+        ret = self._post(_Operation.insert, req)
+        return self._invalidate(ret)
 
     def insert_many(
         self,
         items: List[Union[EmbeddedItem, str]],
         reindex: bool = True,
-    ) -> IndexInsertResponse:
-        new_items = []
-        for item in items:
-            if isinstance(item, str):
-                new_items.append(EmbeddedItem(value=item))
-            else:
-                new_items.append(item)
+        batch_size: int = 128,
+        max_workers: int = 4,
+    ) -> Task[IndexInsertResponse]:
+        """Insert many items, sending them to the engine in requests of at most `batch_size` items.
+
+        All batches but the last are dispatched concurrently on up to `max_workers` threads, without reindexing, and
+        waited on for their item IDs. The last batch is sent once they have finished and alone carries `reindex`, so
+        at most one reindex is started; it is not waited on.
+
+        Returns the Task of the last batch. Once it has completed, its output lists the item IDs of every batch, in
+        the order the items were provided.
+        """
+        if batch_size < 1:
+            raise SteamshipError(message=f"`batch_size` must be at least 1. Got {batch_size}.")
+        if max_workers < 1:
+            raise SteamshipError(message=f"`max_workers` must be at least 1. Got {max_workers}.")
+        if not items:
+            return Task(
+                client=self.client,
+                state=TaskState.succeeded,
+                output=IndexInsertResponse(item_ids=[]),
+            )
 
-        req = IndexInsertRequest(
+        # Items are prepared for insertion in a single pass; bare strings carry no metadata and need no clone.
+        new_items = (
+            EmbeddedItem(value=item) if isinstance(item, str) else item.clone_for_insert()
+            for item in items
+        )
+        batches = list(iter(lambda: list(islice(new_items, batch_size)), []))
+
+        earlier_item_ids = []
+        try:
+            if len(batches) > 1:
+                with ThreadPoolExecutor(max_workers=max_workers) as executor:
+                    futures = [
+                        executor.submit(self._insert_batch, batch, reindex=False, wait=True)
+                        for batch in batches[:-1]
+                    ]
+                    for future in futures:
+                        earlier_item_ids.extend(future.result().item_ids or [])
+            ret = self._insert_batch(batches[-1], reindex)
+        except Exception:
+            # The batches sent before the failure have already been inserted.
+            self._invalidate(None)
+            raise
+
+        if isinstance(ret, Task) and not earlier_item_ids:
+            return self._invalidate(ret)
+        return self._invalidate(_InsertManyTask.of(self.client, ret, earlier_item_ids))
+
+    def _insert_batch(
+        self,
+        items: List[EmbeddedItem],
+        reindex: bool,
+        wait: bool = False,
+    ) -> Union[Task[IndexInsertResponse], IndexInsertResponse]:
+        # The items are already-validated EmbeddedItems, so skip re-validating (and copying) each one.
+        req = IndexInsertRequest.construct(
             index_id=self.id,
-            items=[item.clone_for_insert() for item in new_items],
+            items=items,
             reindex=reindex,
         )
-        return self.client.post(
-            "embedding-index/item/create",
-            req,
-            expect=IndexInsertResponse,
-        )
+        ret = self._post(_Operation.insert, req)
+        if wait and isinstance(ret, Task):
+            # The engine deferred the insert; its item IDs are only known once the task completes.
+            ret.wait()
+            if ret.state == TaskState.failed:
+                raise ret.as_error()
+            ret = ret.output
+        return ret
 
     def insert(
         self,
@@ -235,37 +409,24 @@ class EmbeddingIndex(CamelModel):
             metadata=metadata_to_str(metadata),
             reindex=reindex,
         )
-        return self.client.post(
-            "embedding-index/item/create",
-            req,
-            expect=IndexInsertResponse,
-        )
+        ret = self._post(_Operation.insert, req)
+        return self._invalidate(ret)
 
     def embed(
         self,
     ) -> Task[IndexEmbedResponse]:
         req = IndexEmbedRequest(id=self.id)
-        return self.client.post(
-            "embedding-index/embed",
-            req,
-            expect=IndexEmbedResponse,
-        )
+        ret = self._post(_Operation.embed, req)
+        return self._invalidate(ret)
 
     def create_snapshot(self) -> IndexSnapshotResponse:
         req = IndexSnapshotRequest(index_id=self.id)
-        return self.client.post(
-            "embedding-index/snapshot/create",
-            req,
-            expect=IndexSnapshotResponse,
-        )
+        ret = self._post(_Operation.create_snapshot, req)
+        return self._invalidate(ret)
 
     def list_snapshots(self) -> ListSnapshotsResponse:
         req = ListSnapshotsRequest(id=self.id)
-        return self.client.post(
-            "embedding-index/snapshot/list",
-            req,
-            expect=ListSnapshotsResponse,
-        )
+        return self._post(_Operation.list_snapshots, req)
 
     def list_items(
         self,
@@ -274,52 +435,124 @@ class EmbeddingIndex(CamelModel):
         span_id: str = None,
     ) -> ListItemsResponse:
         req = ListItemsRequest(id=self.id, file_id=file_id, block_id=block_id, spanId=span_id)
-        return self.client.post(
-            "embedding-index/item/list",
-            req,
-            expect=ListItemsResponse,
-        )
+        return self._post(_Operation.list_items, req)
 
     def delete_snapshot(
         self,
         snapshot_id: str,
     ) -> DeleteSnapshotsResponse:
         req = DeleteSnapshotsRequest(snapshotId=snapshot_id)
-        return self.client.post(
-            "embedding-index/snapshot/delete",
-            req,
-            expect=DeleteSnapshotsResponse,
-        )
+        ret = self._post(_Operation.delete_snapshot, req)
+        return self._invalidate(ret)
 
     def delete(self) -> EmbeddingIndex:
-        return self.client.post(
-            "embedding-index/delete",
-            DeleteRequest(id=self.id),
-            expect=EmbeddingIndex,
-        )
+        ret = self._post(_Operation.delete, DeleteRequest(id=self.id))
+        return self._invalidate(ret)
 
     def search(
         self,
-        query: Union[str, List[str]],
+        query: Union[str, List[str], Tuple[str, ...]],
         k: int = 1,
         include_metadata: bool = False,
+        parallel: bool = False,
+        max_workers: int = 4,
+        use_cache: bool = False,
     ) -> Task[QueryResults]:
-        if isinstance(query, list):
-            req = IndexSearchRequest(
-                id=self.id, queries=query, k=k, include_metadata=include_metadata
-            )
-        else:
-            req = IndexSearchRequest(
-                id=self.id, query=query, k=k, include_metadata=include_metadata
+        """Search the index for the `k` items nearest to `query`.
+
+        If `use_cache` is set, a search repeated within the cache's time-to-live is answered from a client-side cache
+        of completed searches, as a copy without a `task_id`. The cache is cleared by this object's mutating methods
+        and is not used while a Task they returned is still running, but changes made to the index by other means
+        are not observed until `clear_search_cache` is called or the entry expires.
+
+        If `query` is a list of queries and `parallel` is set, each query is sent as its own request on up to
+        `max_workers` threads instead of as one batch, and the results are returned together, in query order, as an
+        already-completed Task. That Task is assembled client-side and has no `task_id`, so it cannot be refreshed
+        or commented on.
+        """
+        if parallel and max_workers < 1:
+            raise SteamshipError(message=f"`max_workers` must be at least 1. Got {max_workers}.")
+
+        is_batch = isinstance(query, (list, tuple))
+        if is_batch and not query:
+            # Nothing to search for; answer locally rather than making a round trip.
+            return Task(
+                client=self.client, state=TaskState.succeeded, output=QueryResults(items=[])
             )
-        ret = self.client.post(
-            "embedding-index/search",
-            req,
-            expect=QueryResults,
-        )
 
+        generation = self._cache_generation() if use_cache else None
+        if is_batch and parallel:
+            return self._search_parallel(query, k, include_metadata, max_workers, generation)
+
+        cache_key = None
+        if generation is not None:
+            cache_key = (self.id, tuple(query) if is_batch else query, k, include_metadata)
+            cached = self._cache.get(cache_key)
+            if cached is not None:
+                return _copy_search_task(cached)
+
+        return self._search(query, k, include_metadata, cache_key, generation)
+
+    def _search(
+        self,
+        query: Union[str, List[str], Tuple[str, ...]],
+        k: int,
+        include_metadata: bool,
+        cache_key: Optional[Tuple],
+        generation: Optional[int],
+        wait: bool = False,
+    ) -> Union[Task[QueryResults], QueryResults]:
+        is_batch = isinstance(query, (list, tuple))
+        req = IndexSearchRequest(
+            id=self.id,
+            query=None if is_batch else query,
+            queries=query if is_batch else None,
+            k=k,
+            include_metadata=include_metadata,
+        )
+        ret = self._post(_Operation.search, req)
+        if wait and isinstance(ret, Task):
+            ret.wait()
+            if ret.state == TaskState.failed:
+                raise ret.as_error()
+
+        # Only completed searches are cached; a pending Task still has to be polled by the caller.
+        if cache_key is not None and isinstance(ret, Task) and ret.state == TaskState.succeeded:
+            self._cache_put(cache_key, generation, ret)
         return ret
 
+    def _search_parallel(
+        self,
+        queries: Union[List[str], Tuple[str, ...]],
+        k: int,
+        include_metadata: bool,
+        max_workers: int,
+        generation: Optional[int],
+    ) -> Task[QueryResults]:
+        results: List[Optional[Union[Task[QueryResults], QueryResults]]] = [None] * len(queries)
+        misses = []
+        for i, query in enumerate(queries):
+            cache_key = (self.id, query, k, include_metadata) if generation is not None else None
+            cached = self._cache.get(cache_key) if cache_key is not None else None
+            if cached is not None:
+                results[i] = _copy_search_task(cached)
+            else:
+                misses.append((i, query, cache_key))
+
+        if misses:
+            with ThreadPoolExecutor(max_workers=max_workers) as executor:
+                futures = {
+                    executor.submit(
+                        self._search, query, k, include_metadata, cache_key, generation, wait=True
+                    ): i
+                    for i, query, cache_key in misses
+                }
+                for future in as_completed(futures):
+                    results[futures[future]] = future.result()
+
+        items = [item for result in results for item in _query_results(result).items or []]
+        return Task(client=self.client, state=TaskState.succeeded, output=QueryResults(items=items))
+
     @staticmethod
     def create(
         client: Client,
@@ -341,7 +574,21 @@ class EmbeddingIndex(CamelModel):
             metadata=metadata,
         )
         return client.post(
-            "embedding-index/create",
+            _Operation.create,
             req,
-            expect=EmbeddingIndex,
+            expect=_EXPECT[_Operation.create],
         )
+
+
+# The response type the engine returns for each operation.
+_EXPECT: Dict[str, Type] = {
+    _Operation.create: EmbeddingIndex,
+    _Operation.insert: IndexInsertResponse,
+    _Operation.embed: IndexEmbedResponse,
+    _Operation.create_snapshot: IndexSnapshotResponse,
+    _Operation.list_snapshots: ListSnapshotsResponse,
+    _Operation.list_items: ListItemsResponse,
+    _Operation.delete_snapshot: DeleteSnapshotsResponse,
+    _Operation.delete: EmbeddingIndex,
+    _Operation.search: QueryResults,
+}
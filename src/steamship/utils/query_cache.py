@@ -0,0 +1,71 @@
+"""A small, thread-safe LRU cache with per-entry expiry, used to memoize search results client-side."""
+
+import threading
+import time
+from collections import OrderedDict
+from typing import Any, Dict, Hashable, Optional, Tuple
+
+
+class QueryCache:
+    """A least-recently-used cache whose entries expire after `ttl_seconds`.
+
+    Entries are evicted in LRU order once more than `max_size` are stored. All operations hold a re-entrant lock,
+    so a single instance may be shared between threads.
+    """
+
+    __slots__ = ("max_size", "ttl_seconds", "_entries", "_lock", "_hits", "_misses")
+
+    max_size: int
+    ttl_seconds: float
+
+    def __init__(self, max_size: int = 1024, ttl_seconds: float = 300):
+        self.max_size = max_size
+        self.ttl_seconds = ttl_seconds
+        self._entries: "OrderedDict[Hashable, Tuple[float, Any]]" = OrderedDict()
+        self._lock = threading.RLock()
+        self._hits = 0
+        self._misses = 0
+
+    def get(self, key: Hashable) -> Optional[Any]:
+        """Return the value stored under `key`, or None if it is absent or expired."""
+        with self._lock:
+            entry = self._entries.get(key)
+            if entry is not None:
+                expires_at, value = entry
+                if time.monotonic() < expires_at:
+                    self._entries.move_to_end(key)
+                    self._hits += 1
+                    return value
+                del self._entries[key]
+            self._misses += 1
+            return None
+
+    def put(self, key: Hashable, value: Any) -> None:
+        """Store `value` under `key`, evicting the least recently used entry if the cache is full."""
+        if self.max_size <= 0:
+            return
+        with self._lock:
+            self._entries[key] = (time.monotonic() + self.ttl_seconds, value)
+            self._entries.move_to_end(key)
+            while len(self._entries) > self.max_size:
+                self._entries.popitem(last=False)
+
+    def clear(self) -> None:
+        """Drop every entry. Hit and miss counters are preserved."""
+        with self._lock:
+            self._entries.clear()
+
+    def __len__(self) -> int:
+        with self._lock:
+            return len(self._entries)
+
+    def get_stats(self) -> Dict[str, Any]:
+        """Return the number of hits and misses served so far, and the resulting hit rate."""
+        with self._lock:
+            total = self._hits + self._misses
+            return {
+                "size": len(self._entries),
+                "hits": self._hits,
+                "misses": self._misses,
+                "hit_rate": self._hits / total if total else 0.0,
+            }
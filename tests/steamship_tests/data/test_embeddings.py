@@ -0,0 +1,283 @@
+from unittest.mock import patch
+
+import pytest
+
+from steamship import Steamship, SteamshipError
+from steamship.base import Task, TaskState
+from steamship.base.client import Client
+from steamship.data.embeddings import (
+    _EXPECT,
+    EmbeddedItem,
+    EmbeddingIndex,
+    IndexInsertRequest,
+    IndexInsertResponse,
+    IndexItemId,
+    IndexSearchRequest,
+    QueryResult,
+    QueryResults,
+    _Operation,
+)
+from steamship.data.search import Hit
+from steamship.utils.metadata import str_to_metadata
+
+
+def _index(client: Steamship) -> EmbeddingIndex:
+    return EmbeddingIndex(client=client, id="test-index")
+
+
+def _echo_insert(operation: str, req: IndexInsertRequest, **kwargs) -> IndexInsertResponse:
+    return IndexInsertResponse(item_ids=[IndexItemId(id=item.value) for item in req.items])
+
+
+def test_insert_many_batches(offline_client: Steamship):
+    index = _index(offline_client)
+    items = [f"item-{i}" if i % 2 else EmbeddedItem(value=f"item-{i}") for i in range(10)]
+
+    with patch.object(Client, "post", side_effect=_echo_insert) as post:
+        res = index.insert_many(items, batch_size=3)
+
+    assert post.call_count == 4
+    assert [len(call.args[1].items) for call in post.call_args_list] == [3, 3, 3, 1]
+    assert res.state == TaskState.succeeded
+    assert [item_id.id for item_id in res.output.item_ids] == [f"item-{i}" for i in range(10)]
+
+    # Only the last batch, sent after the others, reindexes
+    assert [call.args[1].reindex for call in post.call_args_list] == [False, False, False, True]
+
+    # The request body is the same as that of a validated request
+    req = post.call_args_list[-1].args[1]
+    expected = IndexInsertRequest(index_id=index.id, items=req.items, reindex=True)
+    assert req.dict(by_alias=True) == expected.dict(by_alias=True)
+
+
+def test_insert_many_clears_cache_when_a_batch_fails(offline_client: Steamship):
+    index = _index(offline_client)
+    with patch.object(Client, "post", return_value=_search_task(offline_client)):
+        index.search("pizza", use_cache=True)
+
+    def _fail_second_batch(operation: str, req: IndexInsertRequest, **kwargs):
+        if req.items[0].value == "item-3":
+            raise SteamshipError(message="Insert failed")
+        return _echo_insert(operation, req)
+
+    with patch.object(Client, "post", side_effect=_fail_second_batch):
+        with pytest.raises(SteamshipError):
+            index.insert_many([f"item-{i}" for i in range(10)], batch_size=3)
+
+    assert len(index._cache) == 0
+
+
+def _insert_task(client: Steamship, req: IndexInsertRequest, state: str) -> Task:
+    output = (
+        _echo_insert("embedding-index/item/create", req) if state == TaskState.succeeded else None
+    )
+    return Task(client=client, task_id=f"insert-{req.items[0].value}", state=state, output=output)
+
+
+def test_insert_many_returns_the_last_batch_task(offline_client: Steamship):
+    index = _index(offline_client)
+
+    def _defer_last_batch(operation: str, req: IndexInsertRequest, **kwargs) -> Task:
+        state = TaskState.running if req.reindex else TaskState.succeeded
+        return _insert_task(offline_client, req, state)
+
+    with patch.object(Client, "post", side_effect=_defer_last_batch) as post:
+        res = index.insert_many([f"item-{i}" for i in range(5)], batch_size=2)
+        single = index.insert_many(["item-0"])
+
+    # The reindexing batch is not waited on: no status polls were made
+    assert post.call_count == 4
+    assert res.task_id == "insert-item-4"
+    assert res.state == TaskState.running
+    assert single.task_id == "insert-item-0"
+
+    # Once the last batch completes, the output lists the items of every batch
+    completed = _insert_task(offline_client, post.call_args_list[2].args[1], TaskState.succeeded)
+    res.update(completed)
+    assert [item_id.id for item_id in res.output.item_ids] == [f"item-{i}" for i in range(5)]
+
+
+def test_insert_many_validates_arguments(offline_client: Steamship):
+    index = _index(offline_client)
+    with pytest.raises(SteamshipError):
+        index.insert_many(["item"], batch_size=0)
+    with pytest.raises(SteamshipError):
+        index.insert_many(["item"], max_workers=0)
+
+
+def _search_task(client: Client) -> Task[QueryResults]:
+    hit = Hit(value="Pizza", metadata='{"kind": "food"}')
+    return Task(
+        client=client,
+        task_id="search-task",
+        state=TaskState.succeeded,
+        output=QueryResults(items=[QueryResult(value=hit, score=1.0)]),
+    )
+
+
+def test_search_cache(offline_client: Steamship):
+    index = _index(offline_client)
+
+    with patch.object(Client, "post", return_value=_search_task(offline_client)) as post:
+        first = index.search("pizza", k=2, use_cache=True)
+        # Mutating a returned result must not leak into the cache
+        first.output.items[0].value.metadata["kind"] = "changed"
+
+        second = index.search("pizza", k=2, use_cache=True)
+        assert post.call_count == 1
+        assert second.output.items[0].value.metadata == {"kind": "food"}
+        # A cached result is a new search, not the engine task that produced it
+        assert second.task_id is None
+
+        index.search("pizza", k=3, use_cache=True)
+        assert post.call_count == 2
+
+        index.create_snapshot()
+        index.search("pizza", k=2, use_cache=True)
+        assert post.call_count == 4
+
+    stats = index.search_cache_stats()
+    assert stats["hits"] == 1
+    assert stats["misses"] == 3
+
+
+def test_search_cache_is_opt_in(offline_client: Steamship):
+    index = _index(offline_client)
+
+    with patch.object(Client, "post", return_value=_search_task(offline_client)) as post:
+        index.search("pizza")
+        res = index.search("pizza")
+
+    assert post.call_count == 2
+    assert res.task_id == "search-task"
+
+
+def test_search_cache_bypassed_while_mutation_runs(offline_client: Steamship):
+    index = _index(offline_client)
+    snapshot = Task(client=offline_client, task_id="snapshot-task", state=TaskState.running)
+
+    with patch.object(Client, "post", return_value=_search_task(offline_client)) as post:
+        index.search("pizza", use_cache=True)
+
+    with patch.object(Client, "post", return_value=snapshot):
+        index.create_snapshot()
+
+    with patch.object(Client, "post", return_value=_search_task(offline_client)) as post:
+        index.search("pizza", use_cache=True)
+        index.search("pizza", use_cache=True)
+        assert post.call_count == 2
+
+        # Once the snapshot is seen to finish, results are cached again
+        snapshot.state = TaskState.succeeded
+        index.search("pizza", use_cache=True)
+        index.search("pizza", use_cache=True)
+        assert post.call_count == 3
+
+
+def test_search_cache_bypassed_while_insert_many_runs(offline_client: Steamship):
+    index = _index(offline_client)
+
+    with patch.object(Client, "post", return_value=_search_task(offline_client)):
+        index.search("pizza", use_cache=True)
+
+    def _running_insert(operation: str, req: IndexInsertRequest, **kwargs) -> Task:
+        return _insert_task(offline_client, req, TaskState.running)
+
+    with patch.object(Client, "post", side_effect=_running_insert):
+        insert = index.insert_many(["new"])
+
+    with patch.object(Client, "post", return_value=_search_task(offline_client)) as post:
+        index.search("pizza", use_cache=True)
+        index.search("pizza", use_cache=True)
+        assert post.call_count == 2
+
+        # Once the insert is seen to finish, results are cached again
+        insert.state = TaskState.succeeded
+        index.search("pizza", use_cache=True)
+        index.search("pizza", use_cache=True)
+        assert post.call_count == 3
+
+
+def test_search_racing_a_mutation_is_not_cached(offline_client: Steamship):
+    index = _index(offline_client)
+
+    def _search_during_invalidation(operation: str, req: IndexSearchRequest, **kwargs):
+        # Another thread invalidates the index while this search is in flight
+        index.clear_search_cache()
+        return _search_task(offline_client)
+
+    with patch.object(Client, "post", side_effect=_search_during_invalidation) as post:
+        index.search("pizza", use_cache=True)
+        index.search("pizza", use_cache=True)
+
+    assert post.call_count == 2
+    assert len(index._cache) == 0
+
+
+def test_clone_for_insert_serializes_metadata():
+    item = EmbeddedItem(value="Pizza", external_id="pizza", metadata={"nums": [1, 2, 3]})
+    clone = item.clone_for_insert()
+
+    assert str_to_metadata(clone.metadata) == {"nums": [1, 2, 3]}
+    assert clone.value == item.value
+    assert clone.external_id == item.external_id
+    assert item.metadata == {"nums": [1, 2, 3]}
+
+
+def test_empty_inputs_skip_the_engine(offline_client: Steamship):
+    index = _index(offline_client)
+
+    with patch.object(Client, "post") as post:
+        assert index.insert_many([]).output.item_ids == []
+        res = index.search([])
+
+    post.assert_not_called()
+    assert res.state == TaskState.succeeded
+    assert res.output.items == []
+
+
+def test_every_operation_has_an_expected_response():
+    operations = {v for k, v in vars(_Operation).items() if not k.startswith("_")}
+    assert set(_EXPECT) == operations
+
+
+def test_parallel_search_preserves_query_order(offline_client: Steamship):
+    index = _index(offline_client)
+
+    def _echo_search(operation: str, req: IndexSearchRequest, **kwargs) -> Task[QueryResults]:
+        hit = Hit(value=req.query, query=req.query)
+        return Task(
+            client=index.client,
+            state=TaskState.succeeded,
+            output=QueryResults(items=[QueryResult(value=hit, score=1.0)]),
+        )
+
+    queries = [f"query-{i}" for i in range(6)]
+    with patch.object(Client, "post", side_effect=_echo_search) as post:
+        index.search("query-2", use_cache=True)
+        res = index.search(queries, parallel=True, max_workers=3, use_cache=True)
+
+    # "query-2" was answered from the cache
+    assert post.call_count == 6
+    assert all(call.args[1].queries is None for call in post.call_args_list)
+    assert res.state == TaskState.succeeded
+    assert [item.value.value for item in res.output.items] == queries
+
+
+def test_parallel_search_accepts_plain_results(offline_client: Steamship):
+    index = _index(offline_client)
+
+    def _echo_search(operation: str, req: IndexSearchRequest, **kwargs) -> QueryResults:
+        return QueryResults(items=[QueryResult(value=Hit(value=req.query), score=1.0)])
+
+    with patch.object(Client, "post", side_effect=_echo_search):
+        res = index.search(["a", "b"], parallel=True)
+
+    assert res.task_id is None
+    assert [item.value.value for item in res.output.items] == ["a", "b"]
+
+
+def test_parallel_search_validates_max_workers(offline_client: Steamship):
+    index = _index(offline_client)
+    with pytest.raises(SteamshipError):
+        index.search(["a", "b"], parallel=True, max_workers=0)
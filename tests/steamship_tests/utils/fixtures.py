@@ -1,10 +1,12 @@
 from typing import Callable, Optional, Type
+from unittest.mock import patch
 
 import pytest
 from steamship_tests.utils.client import get_steamship_client
 from steamship_tests.utils.random import random_name
 
 from steamship import Steamship, Workspace
+from steamship.base.client import Client
 from steamship.invocable import InvocableRequest, Invocation, InvocationContext, LoggingConfig
 from steamship.invocable.invocable import Invocable
 from steamship.invocable.lambda_handler import create_safe_handler as _create_handler
@@ -32,6 +34,21 @@ def client() -> Steamship:
     workspace.delete()
 
 
+def _skip_workspace_switch(self, *args, **kwargs):
+    pass
+
+
+@pytest.fixture()
+def offline_client() -> Steamship:
+    """Returns a client that is never connected to the engine.
+
+    The workspace switch normally performed on construction is skipped, so tests using this
+    fixture should patch `Client.post` with the responses they expect.
+    """
+    with patch.object(Client, "switch_workspace", _skip_workspace_switch):
+        return Steamship(api_key="test-key")
+
+
 @pytest.fixture()
 def invocable_handler(request) -> Callable[[str, str, Optional[dict]], dict]:
     """
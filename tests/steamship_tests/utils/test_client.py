@@ -9,7 +9,7 @@ from steamship_tests.utils.client import TESTING_PROFILE
 from steamship_tests.utils.fixtures import get_steamship_client
 
 from steamship import Steamship
-from steamship.base.client import Client
+from steamship.base.client import _CONNECTION_POOL_SIZE, Client
 from steamship.base.configuration import DEFAULT_API_BASE, DEFAULT_APP_BASE, DEFAULT_WEB_BASE
 from steamship.data.user import User
 
@@ -132,3 +132,10 @@ def test_invocable_call_rewriting(app_base: str, user: str, fixed_base: str):
 
     output_url = client._url(is_package_call=True, package_owner=user, operation=operation)
     assert output_url == f"{fixed_base}{operation}"
+
+
+def test_session_connection_pool(offline_client: Steamship) -> None:
+    for prefix in ("https://", "http://"):
+        url = f"{prefix}api.test.com"
+        pool = offline_client._session.get_adapter(url).poolmanager.connection_from_url(url)
+        assert pool.pool.maxsize == _CONNECTION_POOL_SIZE
@@ -0,0 +1,32 @@
+import json
+import math
+
+import pytest
+
+from steamship.utils.metadata import metadata_to_str, str_to_metadata
+
+METADATA = [
+    None,
+    "a string",
+    "non-ASCII: café",
+    1,
+    1.5,
+    True,
+    math.inf,
+    -math.inf,
+    math.nan,
+    [1, "two", {"three": 3.0}],
+    {"nested": {"list": [True, None]}, "id": "abc"},
+    {"big": 2**70},
+    {"a": math.nan, "b": [math.inf]},
+]
+
+
+@pytest.mark.parametrize("metadata", METADATA)
+def test_metadata_round_trip(metadata):
+    # Compare encodings, since NaN never equals itself
+    assert json.dumps(str_to_metadata(metadata_to_str(metadata))) == json.dumps(metadata)
+
+
+def test_metadata_format():
+    assert metadata_to_str({"a": [1, "é"]}) == '{"a": [1, "\\u00e9"]}'
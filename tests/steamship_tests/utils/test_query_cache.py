@@ -0,0 +1,32 @@
+from steamship.utils.query_cache import QueryCache
+
+
+def test_query_cache_lru_eviction():
+    cache = QueryCache(max_size=2)
+    cache.put("a", 1)
+    cache.put("b", 2)
+    assert cache.get("a") == 1  # "a" is now the most recently used
+    cache.put("c", 3)
+    assert cache.get("b") is None
+    assert cache.get("a") == 1
+    assert cache.get("c") == 3
+    assert len(cache) == 2
+
+
+def test_query_cache_ttl_and_stats():
+    cache = QueryCache(ttl_seconds=0)
+    cache.put("a", 1)
+    assert cache.get("a") is None
+    assert len(cache) == 0
+
+    cache = QueryCache()
+    cache.put("a", 1)
+    assert cache.get("a") == 1
+    assert cache.get("b") is None
+    stats = cache.get_stats()
+    assert stats["hits"] == 1
+    assert stats["misses"] == 1
+    assert stats["hit_rate"] == 0.5
+
+    cache.clear()
+    assert cache.get("a") is None